@@ -526,7 +526,7 @@ function viewVisualization() {
     
     // Open visualization in new window
     const dataParam = encodeURIComponent(JSON.stringify(mockData));
-    const newWindow = window.open(`visualization.html?data=${dataParam}`, '_blank');
+    const newWindow = window.open(`visualization.html?v=1.0.0&data=${dataParam}`, '_blank');
     
     if (!newWindow) {
         alert('Please allow popups to view the visualization');
@@ -2,11 +2,93 @@
 
 import pandas as pd
 import numpy as np
+import functools
+import importlib.util
 import os
 from datetime import datetime, timedelta
 
-# Set random seed for reproducibility
-np.random.seed(42)
+# Numba is optional and only imported for runs large enough to repay its
+# import and compile cost; smaller runs use the NumPy flow builder
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+NUMBA_MIN_ROWS = 100_000
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:  # pyarrow is optional; write_csv falls back to fast_to_csv
+    pa = None
+
+def _csv_cells(values, float_format):
+    """
+    Format one column as CSV text in a single bulk call
+    
+    float_format applies to float32 metrics only; float64 columns such as
+    coordinates keep their full-precision repr, as with DataFrame.to_csv.
+    Strings containing a delimiter, quote or line break are quoted
+    """
+    if pd.api.types.is_float_dtype(values) and values.dtype.itemsize < 8:
+        return np.char.mod(float_format, values.to_numpy())
+    cells = np.asarray(values.astype(str), dtype=str)
+    if not pd.api.types.is_numeric_dtype(values):
+        quote = np.zeros(len(cells), dtype=bool)
+        for char in (',', '"', '\n', '\r'):
+            quote |= np.char.find(cells, char) >= 0
+        if quote.any():
+            quoted = np.char.add(np.char.add('"', np.char.replace(cells, '"', '""')), '"')
+            cells = np.where(quote, quoted, cells)
+    return cells
+
+
+def fast_to_csv(df, path, float_format='%.4f'):
+    """
+    Write a small numeric/short-string DataFrame to CSV without going through
+    pandas' per-cell writer: each column is formatted in one bulk call, the
+    columns are joined element-wise and the result is written as one blob
+    """
+    fields = [_csv_cells(df[col], float_format) for col in df.columns]
+
+    rows = fields[0]
+    for cells in fields[1:]:
+        rows = np.char.add(np.char.add(rows, ','), cells)
+
+    header = ','.join(map(str, df.columns))
+    blob = '\n'.join([header, *rows.tolist()]) + '\n'
+    with open(path, 'wb', buffering=8 << 20) as f:
+        f.write(blob.encode('utf-8'))
+
+
+def write_csv(df, path, float_format='%.4f'):
+    """
+    Write a generated dataset to CSV, using Arrow's chunked multi-threaded
+    writer when pyarrow is installed and fast_to_csv otherwise
+    
+    Both paths produce the same bytes: floats and timestamps are formatted
+    by _csv_cells before Arrow sees them, and Arrow writes unquoted. Arrow
+    can only quote every string or none, so a dataset with a string that
+    needs quoting is written by fast_to_csv instead
+    """
+    if pa is None:
+        fast_to_csv(df, path, float_format)
+        return
+    columns = {
+        col: _csv_cells(df[col], float_format)
+        if pd.api.types.is_float_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col])
+        else df[col]
+        for col in df.columns
+    }
+    table = pa.Table.from_pandas(pd.DataFrame(columns, copy=False), preserve_index=False)
+    try:
+        # Arrow quotes header names even with quoting_style='none'
+        with open(path, 'wb', buffering=8 << 20) as f:
+            f.write((','.join(map(str, df.columns)) + '\n').encode('utf-8'))
+            pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(
+                include_header=False, batch_size=65536, quoting_style='none'))
+    except pa.ArrowInvalid:
+        fast_to_csv(df, path, float_format)
+
+
+# Seeded PCG64 generator for reproducibility
+rng = np.random.default_rng(np.random.SeedSequence(42))
 
 # Create output folder
 os.makedirs("../data", exist_ok=True)
@@ -21,100 +103,135 @@ cities = {
 }
 
 # Generate traffic network data with coordinates
-network_data = []
 current_time = datetime.now()
+zones_per_city = [len(info['zones']) for info in cities.values()]
+n_network = sum(zones_per_city)
+
+city_idx = np.repeat(np.arange(len(cities)), zones_per_city)
+zones_arr = np.concatenate([info['zones'] for info in cities.values()])
+lat_base = np.repeat([info['lat'] for info in cities.values()], zones_per_city)
+lon_base = np.repeat([info['lon'] for info in cities.values()], zones_per_city)
 
-for city, info in cities.items():
-    for i, zone in enumerate(info['zones']):
-        # Create realistic coordinates around city center
-        lat_offset = np.random.normal(0, 0.05)
-        lon_offset = np.random.normal(0, 0.05)
-        
-        # Generate traffic conditions (mimicking the color coding in the reference)
-        traffic_condition = np.random.choice(['Good', 'Moderate', 'Congested'], p=[0.4, 0.4, 0.2])
-        speed_mapping = {'Good': (45, 65), 'Moderate': (25, 45), 'Congested': (5, 25)}
-        min_speed, max_speed = speed_mapping[traffic_condition]
-        
-        network_data.append({
-            'City': city,
-            'Zone': zone,
-            'Latitude': info['lat'] + lat_offset,
-            'Longitude': info['lon'] + lon_offset,
-            'Traffic_Condition': traffic_condition,
-            'Current_Speed': np.random.uniform(min_speed, max_speed),
-            'Volume': np.random.randint(500, 3000),
-            'Timestamp': current_time,
-            'Route_Density': np.random.uniform(0.3, 1.0)
-        })
-
-df_network = pd.DataFrame(network_data)
-df_network.to_csv("../data/traffic_network_data.csv", index=False)
+# Create realistic coordinates around city center
+lat = lat_base + rng.normal(0, 0.05, size=n_network)
+lon = lon_base + rng.normal(0, 0.05, size=n_network)
+
+# Generate traffic conditions (mimicking the color coding in the reference)
+conditions = np.array(['Good', 'Moderate', 'Congested'])
+cond_idx = rng.choice(len(conditions), size=n_network, p=[0.4, 0.4, 0.2])
+min_speed = np.array([45, 25, 5])[cond_idx]
+max_speed = np.array([65, 45, 25])[cond_idx]
+
+df_network = pd.DataFrame({
+    'City': pd.Categorical.from_codes(city_idx, categories=list(cities)),
+    'Zone': zones_arr,
+    'Latitude': lat,
+    'Longitude': lon,
+    'Traffic_Condition': pd.Categorical.from_codes(cond_idx, categories=conditions),
+    'Current_Speed': (min_speed + (max_speed - min_speed) * rng.random(n_network)).astype(np.float32),
+    'Volume': rng.integers(500, 3000, size=n_network, dtype=np.int32),
+    'Timestamp': np.full(n_network, current_time, dtype='datetime64[us]'),
+    'Route_Density': rng.uniform(0.3, 1.0, size=n_network).astype(np.float32)
+}, copy=False)
+write_csv(df_network, "../data/traffic_network_data.csv")
 
 # --------------------------
 # Dataset 2: Time Series Traffic Flow Data
-time_series = pd.date_range(start='2025-07-08 00:00', periods=24, freq='H')
-flow_data = []
-
-for city in cities.keys():
-    for hour in time_series:
-        # Simulate rush hour patterns
-        hour_of_day = hour.hour
-        if 7 <= hour_of_day <= 9 or 17 <= hour_of_day <= 19:
-            congestion_factor = np.random.uniform(0.6, 0.9)  # Higher congestion during rush
-            avg_speed = np.random.uniform(15, 35)
-        elif 22 <= hour_of_day or hour_of_day <= 5:
-            congestion_factor = np.random.uniform(0.1, 0.3)  # Low congestion at night
-            avg_speed = np.random.uniform(50, 70)
-        else:
-            congestion_factor = np.random.uniform(0.3, 0.6)  # Normal traffic
-            avg_speed = np.random.uniform(35, 55)
-        
-        flow_data.append({
-            'City': city,
-            'Timestamp': hour,
-            'Congestion_Level': congestion_factor,
-            'Average_Speed': avg_speed,
-            'Traffic_Volume': np.random.randint(800, 4000),
-            'Incidents': np.random.poisson(1) if congestion_factor > 0.7 else 0
-        })
-
-df_flow = pd.DataFrame(flow_data)
-df_flow.to_csv("../data/traffic_flow_timeseries.csv", index=False)
+time_series = pd.date_range(start='2025-07-08 00:00', periods=24, freq='h')
+n_flow = len(cities) * len(time_series)
+
+# Simulate rush hour patterns: congestion/speed bounds are picked per hour
+# regime and scaled by uniform draws taken from rng, so the output does not
+# depend on which backend builds it. Regimes: 0 = normal, 1 = rush, 2 = night
+congestion_lo = np.array([0.3, 0.6, 0.1])
+congestion_hi = np.array([0.6, 0.9, 0.3])
+speed_lo = np.array([35.0, 15.0, 50.0])
+speed_hi = np.array([55.0, 35.0, 70.0])
+
+
+def _build_flow_numpy(hours, u_cong, u_speed, out_cong, out_speed):
+    rush = ((hours >= 7) & (hours <= 9)) | ((hours >= 17) & (hours <= 19))
+    night = (hours >= 22) | (hours <= 5)
+    regime = rush + 2 * night
+    out_cong[:] = congestion_lo[regime] + (congestion_hi - congestion_lo)[regime] * u_cong
+    out_speed[:] = speed_lo[regime] + (speed_hi - speed_lo)[regime] * u_speed
+
+
+@functools.lru_cache(maxsize=None)
+def _build_flow_jit():
+    """
+    Compile (or load from the on-disk cache) the Numba flow kernel
+    """
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def kernel(hours, u_cong, u_speed, out_cong, out_speed):
+        for i in range(hours.shape[0]):
+            h = hours[i]
+            rush = ((h >= 7) & (h <= 9)) | ((h >= 17) & (h <= 19))
+            night = (h >= 22) | (h <= 5)
+            regime = rush + 2 * night
+            out_cong[i] = congestion_lo[regime] + (congestion_hi[regime] - congestion_lo[regime]) * u_cong[i]
+            out_speed[i] = speed_lo[regime] + (speed_hi[regime] - speed_lo[regime]) * u_speed[i]
+
+    return kernel
+
+
+def _build_flow(hours, u_cong, u_speed, out_cong, out_speed):
+    if HAS_NUMBA and hours.shape[0] >= NUMBA_MIN_ROWS:
+        _build_flow_jit()(hours, u_cong, u_speed, out_cong, out_speed)
+    else:
+        _build_flow_numpy(hours, u_cong, u_speed, out_cong, out_speed)
+
+hour_of_day = np.tile(np.asarray(time_series.hour, dtype=np.int64), len(cities))
+congestion_factor = np.empty(n_flow, dtype=np.float32)
+avg_speed = np.empty(n_flow, dtype=np.float32)
+_build_flow(hour_of_day, rng.random(n_flow), rng.random(n_flow), congestion_factor, avg_speed)
+
+df_flow = pd.DataFrame({
+    'City': pd.Categorical.from_codes(np.repeat(np.arange(len(cities)), len(time_series)),
+                                      categories=list(cities)),
+    'Timestamp': np.tile(time_series, len(cities)),
+    'Congestion_Level': congestion_factor,
+    'Average_Speed': avg_speed,
+    'Traffic_Volume': rng.integers(800, 4000, size=n_flow, dtype=np.int32),
+    'Incidents': (rng.poisson(1, size=n_flow) * (congestion_factor > 0.7)).astype(np.int32)
+}, copy=False)
+write_csv(df_flow, "../data/traffic_flow_timeseries.csv")
 
 # --------------------------
 # Dataset 3: Route Performance Data
-route_data = []
 route_types = ['Highway', 'Main Road', 'Secondary Road', 'Local Street']
+routes_per_type = 5  # 5 routes per type per city
+n_routes = len(cities) * len(route_types) * routes_per_type
+
+# Performance varies by route type: per-type bounds, in route_types order
+base_lo = np.array([60, 30, 20, 15])
+base_hi = np.array([80, 50, 40, 30])
+eff_lo = np.array([0.7, 0.6, 0.5, 0.4])
+eff_hi = np.array([0.95, 0.85, 0.75, 0.7])
+
+type_idx = np.tile(np.repeat(np.arange(len(route_types)), routes_per_type), len(cities))
+base_speed = base_lo[type_idx] + (base_hi - base_lo)[type_idx] * rng.random(n_routes)
+efficiency = eff_lo[type_idx] + (eff_hi - eff_lo)[type_idx] * rng.random(n_routes)
+
+route_city = np.repeat(list(cities), len(route_types) * routes_per_type)
+route_type = np.array(route_types)[type_idx]
+route_num = np.tile(np.arange(1, routes_per_type + 1), len(cities) * len(route_types))
+route_id = np.char.add(np.char.add(np.char.add(route_city, '_'), np.char.add(route_type, '_')),
+                       route_num.astype(str))
 
-for city in cities.keys():
-    for route_type in route_types:
-        for i in range(5):  # 5 routes per type per city
-            # Performance varies by route type
-            if route_type == 'Highway':
-                base_speed = np.random.uniform(60, 80)
-                efficiency = np.random.uniform(0.7, 0.95)
-            elif route_type == 'Main Road':
-                base_speed = np.random.uniform(30, 50)
-                efficiency = np.random.uniform(0.6, 0.85)
-            elif route_type == 'Secondary Road':
-                base_speed = np.random.uniform(20, 40)
-                efficiency = np.random.uniform(0.5, 0.75)
-            else:  # Local Street
-                base_speed = np.random.uniform(15, 30)
-                efficiency = np.random.uniform(0.4, 0.7)
-            
-            route_data.append({
-                'City': city,
-                'Route_Type': route_type,
-                'Route_ID': f"{city}_{route_type}_{i+1}",
-                'Average_Speed': base_speed + np.random.normal(0, 5),
-                'Efficiency_Score': efficiency,
-                'Daily_Volume': np.random.randint(1000, 8000),
-                'Travel_Time_Index': np.random.uniform(1.0, 2.5)
-            })
-
-df_routes = pd.DataFrame(route_data)
-df_routes.to_csv("../data/route_performance.csv", index=False)
+df_routes = pd.DataFrame({
+    'City': pd.Categorical.from_codes(np.repeat(np.arange(len(cities)), len(route_types) * routes_per_type),
+                                      categories=list(cities)),
+    'Route_Type': pd.Categorical.from_codes(type_idx, categories=route_types),
+    'Route_ID': route_id,
+    'Average_Speed': (base_speed + rng.normal(0, 5, size=n_routes)).astype(np.float32),
+    'Efficiency_Score': efficiency.astype(np.float32),
+    'Daily_Volume': rng.integers(1000, 8000, size=n_routes, dtype=np.int32),
+    'Travel_Time_Index': rng.uniform(1.0, 2.5, size=n_routes).astype(np.float32)
+}, copy=False)
+write_csv(df_routes, "../data/route_performance.csv")
 
 print("✅ Enhanced traffic data files generated in /data/")
 print(f"   - Generated {len(df_network)} network points across {len(cities)} cities")
@@ -1,21 +1,100 @@
 # scripts/image_processor.py
 
 import cv2
+import csv
+import functools
+import io
+import itertools
+import os
 import numpy as np
 import pandas as pd
 import pytesseract
 from PIL import Image
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import plotly.graph_objects as go
-import plotly.express as px
+
+class _LoadedImage:
+    """
+    Decoded pixel buffers for one image, shared by every processing stage
+    
+    Buffers are decoded on first access, so routing on the quarter-size
+    thumbnail never pays for a full-resolution decode. `encoded` holds the
+    file bytes for images that were never written to disk.
+    """
+
+    def __init__(self, image_path, encoded=None):
+        self.path = image_path
+        self.encoded = encoded
+
+    def _read(self, flags):
+        if self.encoded is None:
+            image = cv2.imread(self.path, flags)
+        else:
+            image = cv2.imdecode(self.encoded, flags)
+        if image is None:
+            raise ValueError(f'Could not read image: {self.path}')
+        return np.ascontiguousarray(image)
+
+    @functools.cached_property
+    def bgr(self):
+        return self._read(cv2.IMREAD_COLOR)
+
+    @functools.cached_property
+    def gray(self):
+        return cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+
+    @functools.cached_property
+    def thumb(self):
+        # Decoded at 1/4 resolution directly by the codec
+        return self._read(cv2.IMREAD_REDUCED_GRAYSCALE_4)
+
+    @property
+    def ocr_input(self):
+        # Tesseract reads files itself; in-memory images go in as pixels
+        return self.path if self.encoded is None else self.gray
+
+@functools.lru_cache(maxsize=8)
+def _load_arrays(image_path, mtime):
+    """
+    Return one shared image per (path, mtime); a rewritten file gets a new entry
+    """
+    return _LoadedImage(image_path)
 
 class TrafficImageProcessor:
     """
     Smart image processing class for extracting traffic data from various image formats
     """
     
+    # Patterns are compiled once at class load rather than on every call
+    _SPEED_RE = re.compile(r'(\d+)\s*(?:km/h|mph|kph)', re.IGNORECASE)
+    _LOCATION_RE = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+    _TIME_RE = re.compile(r'(\d{1,2}):(\d{2})|(\d{1,2})\s*(?:AM|PM)|(\d{4})-(\d{2})-(\d{2})', re.IGNORECASE)
+    _NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+    _DURATION_RE = re.compile(r'(\d+)\s*(?:min|minutes|hrs|hours)', re.IGNORECASE)
+    _DISTANCE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:km|miles|mi)', re.IGNORECASE)
+    _TABLE_TRIM_RE = re.compile(r'^[ \t]+|[ \t]+$', re.MULTILINE)
+    _TABLE_SEP_RE = re.compile(r'[ \t]{2,}|\t')
+    _TABLE_ROW_RE = re.compile(r'^[^\n]*\t[^\n]*$', re.MULTILINE)
+    
+    # Keyword groups scanned in a single pass each
+    _TRAFFIC_KEYWORDS_RE = re.compile(r'speed|km/h|mph|traffic|congestion', re.IGNORECASE)
+    _MAP_KEYWORDS_RE = re.compile(r'map|route|navigation|street', re.IGNORECASE)
+    _CHART_KEYWORDS_RE = re.compile(r'chart|graph|data|time', re.IGNORECASE)
+    _LIVE_KEYWORDS_RE = re.compile(r'camera|live|current', re.IGNORECASE)
+    _HEAVY_RE = re.compile(r'heavy|congested|slow', re.IGNORECASE)
+    _MODERATE_RE = re.compile(r'moderate|medium', re.IGNORECASE)
+    _LIGHT_RE = re.compile(r'light|clear|good', re.IGNORECASE)
+    
+    # Hue -> traffic color class lookup (0=red, 1=yellow, 2=green, 3=other)
+    _HUE_OTHER = 3
+    _HUE_CLASSES = np.full(256, _HUE_OTHER, dtype=np.intp)
+    _HUE_CLASSES[0:11] = 0    # Congested traffic
+    _HUE_CLASSES[20:40] = 1   # Moderate traffic
+    _HUE_CLASSES[40:81] = 2   # Good traffic
+    
     def __init__(self):
         # Configure tesseract path if needed (Windows)
         # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
@@ -23,66 +102,73 @@ class TrafficImageProcessor:
         self.supported_formats = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.pdf']
         self.extracted_data = []
         
-    def process_image(self, image_path, image_type='auto'):
+    def process_image(self, source, image_type='auto'):
         """
         Main processing function that routes to specific processors based on image type
+        
+        `source` is an image path, or the encoded image as bytes or a
+        readable file object (e.g. an upload that was never saved to disk).
         """
         try:
+            image = self._load(source)
+            
+            # OCR is the most expensive step, so run it once and share the
+            # text between type detection and the selected processor.
+            # Tesseract reads image files itself; pixels are only decoded
+            # here when a processor needs them (colors, chart shape)
+            text = pytesseract.image_to_string(image.ocr_input, config='--psm 6')
+            
             if image_type == 'auto':
-                image_type = self._detect_image_type(image_path)
+                image_type = self._detect_image_type(image, text)
             
             if image_type == 'traffic_map':
-                return self._process_traffic_map(image_path)
+                return self._process_traffic_map(image, text)
             elif image_type == 'chart':
-                return self._process_chart(image_path)
+                return self._process_chart(image, text)
             elif image_type == 'screenshot':
-                return self._process_screenshot(image_path)
+                return self._process_screenshot(text)
             elif image_type == 'table':
-                return self._process_table(image_path)
+                return self._process_table(text)
             else:
-                return self._generic_ocr_processing(image_path)
+                return self._generic_ocr_processing(text)
                 
         except Exception as e:
             return {'error': f'Processing failed: {str(e)}', 'data': None}
     
-    def _detect_image_type(self, image_path):
+    def _load(self, source):
         """
-        Automatically detect the type of traffic-related image
+        Return the decoded buffers for an image path (cached) or an
+        in-memory encoded image (not cached)
         """
-        # Load image
-        image = cv2.imread(image_path)
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Extract text using OCR
-        text = pytesseract.image_to_string(gray).lower()
+        if isinstance(source, (str, os.PathLike)):
+            return _load_arrays(os.fspath(source), os.path.getmtime(source))
         
+        data = source.read() if hasattr(source, 'read') else source
+        return _LoadedImage('<upload>', np.frombuffer(data, dtype=np.uint8))
+    
+    def _detect_image_type(self, image, text):
+        """
+        Automatically detect the type of traffic-related image
+        """
         # Analyze text content to determine image type
-        if any(keyword in text for keyword in ['speed', 'km/h', 'mph', 'traffic', 'congestion']):
-            if any(keyword in text for keyword in ['map', 'route', 'navigation', 'street']):
+        if self._TRAFFIC_KEYWORDS_RE.search(text):
+            if self._MAP_KEYWORDS_RE.search(text):
                 return 'traffic_map'
-            elif any(keyword in text for keyword in ['chart', 'graph', 'data', 'time']):
+            elif self._CHART_KEYWORDS_RE.search(text):
                 return 'chart'
-            elif any(keyword in text for keyword in ['camera', 'live', 'current']):
+            elif self._LIVE_KEYWORDS_RE.search(text):
                 return 'screenshot'
         
-        # Check for table-like structures
-        if self._detect_table_structure(gray):
+        # Check for table-like structures on the thumbnail
+        if self._detect_table_structure(image.thumb):
             return 'table'
             
         return 'chart'  # Default to chart processing
     
-    def _process_traffic_map(self, image_path):
+    def _process_traffic_map(self, image, text):
         """
         Process traffic map images (Google Maps, Waze, etc.)
         """
-        image = cv2.imread(image_path)
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Extract text
-        text = pytesseract.image_to_string(image, config='--psm 6')
-        
         # Look for traffic indicators
         traffic_data = {
             'locations': [],
@@ -92,12 +178,10 @@ class TrafficImageProcessor:
         }
         
         # Extract speed information
-        speed_pattern = r'(\d+)\s*(?:km/h|mph|kph)'
-        speeds = re.findall(speed_pattern, text, re.IGNORECASE)
+        speeds = self._SPEED_RE.findall(text)
         
         # Extract location names
-        location_pattern = r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        locations = re.findall(location_pattern, text)
+        locations = self._LOCATION_RE.findall(text)
         
         # Detect color-coded traffic conditions
         traffic_conditions = self._detect_traffic_colors(image)
@@ -117,28 +201,21 @@ class TrafficImageProcessor:
             'extracted_count': len(traffic_data['locations'])
         }
     
-    def _process_chart(self, image_path):
+    def _process_chart(self, image, text):
         """
         Process chart/graph images and extract data points
         """
-        image = cv2.imread(image_path)
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Extract text from chart
-        text = pytesseract.image_to_string(image, config='--psm 6')
-        
-        # Extract numerical data
-        numbers = re.findall(r'\d+(?:\.\d+)?', text)
-        numbers = [float(n) for n in numbers]
+        # Extract numerical data, limited to 24 data points (24 hours)
+        matches = itertools.islice(self._NUMBER_RE.finditer(text), 24)
+        values = [float(m.group()) for m in matches]
         
         # Extract time/date information
-        time_pattern = r'(\d{1,2}):(\d{2})|(\d{1,2})\s*(?:AM|PM)|(\d{4})-(\d{2})-(\d{2})'
-        times = re.findall(time_pattern, text, re.IGNORECASE)
+        times = self._TIME_RE.findall(text)
         
         # Create structured data
         chart_data = {
-            'values': numbers[:24],  # Limit to 24 data points (24 hours)
-            'labels': [f'Hour {i}' for i in range(len(numbers[:24]))],
+            'values': values,
+            'labels': [f'Hour {i}' for i in range(len(values))],
             'chart_type': self._detect_chart_type(image),
             'timestamp': datetime.now().isoformat()
         }
@@ -149,22 +226,18 @@ class TrafficImageProcessor:
             'extracted_count': len(chart_data['values'])
         }
     
-    def _process_screenshot(self, image_path):
+    def _process_screenshot(self, text):
         """
         Process traffic app screenshots
         """
-        image = cv2.imread(image_path)
-        
-        # Extract text
-        text = pytesseract.image_to_string(image, config='--psm 6')
-        
         # Look for specific app indicators
         app_type = 'unknown'
-        if 'google maps' in text.lower() or 'maps' in text.lower():
+        lowered = text.lower()
+        if 'google maps' in lowered or 'maps' in lowered:
             app_type = 'google_maps'
-        elif 'waze' in text.lower():
+        elif 'waze' in lowered:
             app_type = 'waze'
-        elif 'apple maps' in text.lower():
+        elif 'apple maps' in lowered:
             app_type = 'apple_maps'
         
         # Extract traffic information
@@ -180,30 +253,20 @@ class TrafficImageProcessor:
             'app_detected': app_type
         }
     
-    def _process_table(self, image_path):
+    def _process_table(self, text):
         """
         Process tabular data from images
         """
-        image = cv2.imread(image_path)
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Extract text with table structure
-        text = pytesseract.image_to_string(gray, config='--psm 6')
-        
-        # Parse table structure
-        lines = text.strip().split('\n')
-        table_data = []
-        
-        for line in lines:
-            if line.strip():
-                # Split by multiple spaces or tabs
-                cells = re.split(r'\s{2,}|\t', line.strip())
-                if len(cells) > 1:
-                    table_data.append(cells)
-        
-        # Convert to DataFrame if valid table structure
-        if table_data and len(table_data) > 1:
-            df = pd.DataFrame(table_data[1:], columns=table_data[0])
+        # Turn runs of multiple spaces or tabs into single tab separators and
+        # keep only lines that split into more than one cell
+        normalized = self._TABLE_SEP_RE.sub('\t', self._TABLE_TRIM_RE.sub('', text))
+        table_rows = self._TABLE_ROW_RE.findall(normalized)
+        
+        # Parse with pandas' C reader if valid table structure
+        if len(table_rows) > 1:
+            df = pd.read_csv(io.StringIO('\n'.join(table_rows)), sep='\t', engine='c',
+                             header=0, dtype=str, na_filter=False,
+                             quoting=csv.QUOTE_NONE, on_bad_lines='skip')
             return {
                 'type': 'table',
                 'data': df.to_dict('records'),
@@ -217,20 +280,17 @@ class TrafficImageProcessor:
             'error': 'No valid table structure detected'
         }
     
-    def _generic_ocr_processing(self, image_path):
+    def _generic_ocr_processing(self, text):
         """
         Generic OCR processing for unidentified image types
         """
-        image = cv2.imread(image_path)
-        text = pytesseract.image_to_string(image)
-        
         # Extract any numerical data
-        numbers = re.findall(r'\d+(?:\.\d+)?', text)
+        numbers = [float(n) for n in self._NUMBER_RE.findall(text)]
         
         return {
             'type': 'generic',
             'text': text,
-            'numbers': [float(n) for n in numbers],
+            'numbers': numbers,
             'extracted_count': len(numbers)
         }
     
@@ -238,24 +298,17 @@ class TrafficImageProcessor:
         """
         Detect traffic condition colors in the image
         """
-        # Convert to HSV for better color detection
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
-        # Define color ranges for traffic conditions
-        green_range = [(40, 50, 50), (80, 255, 255)]  # Good traffic
-        yellow_range = [(20, 50, 50), (40, 255, 255)]  # Moderate traffic
-        red_range = [(0, 50, 50), (10, 255, 255)]      # Congested traffic
+        # A dominant-color vote doesn't need every pixel; sample every 4th
+        # pixel in each direction and convert to HSV for color detection
+        sample = np.ascontiguousarray(image.bgr[::4, ::4])
+        hsv = cv2.cvtColor(sample, cv2.COLOR_BGR2HSV)
         
         conditions = []
         
-        # Count pixels in each color range
-        green_mask = cv2.inRange(hsv, np.array(green_range[0]), np.array(green_range[1]))
-        yellow_mask = cv2.inRange(hsv, np.array(yellow_range[0]), np.array(yellow_range[1]))
-        red_mask = cv2.inRange(hsv, np.array(red_range[0]), np.array(red_range[1]))
-        
-        green_pixels = cv2.countNonZero(green_mask)
-        yellow_pixels = cv2.countNonZero(yellow_mask)
-        red_pixels = cv2.countNonZero(red_mask)
+        # Classify every pixel in one pass and tally the classes
+        classes = self._HUE_CLASSES[hsv[..., 0]]
+        classes[(hsv[..., 1] < 50) | (hsv[..., 2] < 50)] = self._HUE_OTHER
+        red_pixels, yellow_pixels, green_pixels, _ = np.bincount(classes.ravel(), minlength=4)
         
         # Determine dominant condition
         if red_pixels > green_pixels and red_pixels > yellow_pixels:
@@ -267,45 +320,56 @@ class TrafficImageProcessor:
         
         return conditions * 5  # Return multiple conditions for multiple locations
     
-    def _detect_table_structure(self, gray_image):
+    def _detect_table_structure(self, thumb):
         """
         Detect if image contains table-like structure
+        
+        Expects the 1/4-resolution grayscale thumbnail; the answer only depends
+        on whether long lines exist, so full resolution isn't needed
         """
-        # Detect horizontal and vertical lines
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
-        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
+        # Binarize with dark strokes as foreground
+        _, binary = cv2.threshold(thumb, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        
+        # Detect horizontal and vertical lines (kernels scaled with the image)
+        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (10, 1))
+        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 10))
         
-        horizontal_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, horizontal_kernel)
-        vertical_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, vertical_kernel)
+        horizontal_lines = cv2.morphologyEx(binary, cv2.MORPH_OPEN, horizontal_kernel)
+        vertical_lines = cv2.morphologyEx(binary, cv2.MORPH_OPEN, vertical_kernel)
         
         # Count detected lines
         h_lines = cv2.countNonZero(horizontal_lines)
         v_lines = cv2.countNonZero(vertical_lines)
         
-        return h_lines > 100 and v_lines > 100  # Threshold for table detection
+        return h_lines > 25 and v_lines > 25  # Threshold for table detection
     
     def _detect_chart_type(self, image):
         """
         Detect the type of chart (bar, line, pie, etc.)
         """
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Detect circular shapes for pie charts
-        circles = cv2.HoughCircles(gray, cv2.HOUGH_GRADIENT, 1, 20, param1=50, param2=30, minRadius=0, maxRadius=0)
-        
-        if circles is not None:
-            return 'pie_chart'
-        
-        # Detect rectangular shapes for bar charts
-        contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        rectangles = 0
-        
-        for contour in contours:
-            approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
-            if len(approx) == 4:
-                rectangles += 1
-        
-        if rectangles > 5:
+        # Binarize once with Otsu so light fills and anti-aliasing don't
+        # fragment shapes into many small noise contours
+        _, binary = cv2.threshold(image.gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        
+        # Pie charts: the largest shape is close to a circle; shapes under 1%
+        # of the image are noise and skip the perimeter test
+        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if contours:
+            areas = [cv2.contourArea(contour) for contour in contours]
+            largest = int(np.argmax(areas))
+            min_area = 0.01 * binary.shape[0] * binary.shape[1]
+            if areas[largest] >= min_area:
+                perimeter = cv2.arcLength(contours[largest], True)
+                if 4 * np.pi * areas[largest] / perimeter ** 2 > 0.85:
+                    return 'pie_chart'
+        
+        # Bar charts: the column-sum profile breaks into several tall plateaus,
+        # whereas a line only covers a few pixels of each column
+        cols = cv2.reduce(binary, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+        tall = cols > 0.1 * 255 * binary.shape[0]
+        plateaus = np.count_nonzero(np.diff(tall.astype(np.int8)) == 1) + int(tall[0])
+        
+        if plateaus > 3:
             return 'bar_chart'
         
         return 'line_chart'  # Default
@@ -321,23 +385,21 @@ class TrafficImageProcessor:
         }
         
         # Extract time estimates
-        time_pattern = r'(\d+)\s*(?:min|minutes|hrs|hours)'
-        time_match = re.search(time_pattern, text, re.IGNORECASE)
+        time_match = self._DURATION_RE.search(text)
         if time_match:
             info['estimated_time'] = time_match.group(1)
         
         # Extract distance
-        distance_pattern = r'(\d+(?:\.\d+)?)\s*(?:km|miles|mi)'
-        distance_match = re.search(distance_pattern, text, re.IGNORECASE)
+        distance_match = self._DISTANCE_RE.search(text)
         if distance_match:
             info['distance'] = distance_match.group(1)
         
         # Extract traffic level indicators
-        if any(word in text.lower() for word in ['heavy', 'congested', 'slow']):
+        if self._HEAVY_RE.search(text):
             info['traffic_level'] = 'Heavy'
-        elif any(word in text.lower() for word in ['moderate', 'medium']):
+        elif self._MODERATE_RE.search(text):
             info['traffic_level'] = 'Moderate'
-        elif any(word in text.lower() for word in ['light', 'clear', 'good']):
+        elif self._LIGHT_RE.search(text):
             info['traffic_level'] = 'Light'
         
         return info
@@ -346,19 +408,17 @@ class TrafficImageProcessor:
         """
         Save extracted data to CSV file
         """
-        if processed_data['type'] == 'traffic_map':
-            df = pd.DataFrame(processed_data['data'])
-            df.to_csv(output_path, index=False)
-        elif processed_data['type'] == 'chart':
-            df = pd.DataFrame(processed_data['data'])
-            df.to_csv(output_path, index=False)
-        elif processed_data['type'] == 'table':
+        # Write through one large buffer and let close() do the only flush
+        if processed_data['type'] in ('traffic_map', 'chart', 'table'):
             df = pd.DataFrame(processed_data['data'])
-            df.to_csv(output_path, index=False)
+            with open(output_path, 'wb', buffering=1 << 20) as f:
+                df.to_csv(f, index=False, chunksize=65536)
         else:
-            # Save as JSON for other types
-            with open(output_path.replace('.csv', '.json'), 'w') as f:
-                json.dump(processed_data, f, indent=2)
+            # Save as compact JSON for other types; serialized before the
+            # file is opened so a failed dump leaves no partial file behind
+            payload = json.dumps(processed_data, separators=(',', ':'))
+            with open(output_path.replace('.csv', '.json'), 'w', buffering=1 << 20) as f:
+                f.write(payload)
     
     def create_visualization_from_extracted_data(self, processed_data):
         """
@@ -426,14 +486,21 @@ class TrafficImageProcessor:
         if not data:
             return None
         
-        df = pd.DataFrame(data)
-        
-        # Try to create appropriate visualization based on data
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        
-        if len(numeric_columns) > 0:
-            fig = px.bar(df, x=df.columns[0], y=numeric_columns[0], 
-                        title='Extracted Table Data')
+        # Only two columns are plotted, so read them straight from the records
+        # rather than building a DataFrame; pick the first numeric one for y
+        columns = list(data[0])
+        numeric_columns = [key for key, value in data[0].items()
+                           if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        
+        if numeric_columns:
+            x_column, y_column = columns[0], numeric_columns[0]
+            fig = go.Figure(go.Bar(x=[row[x_column] for row in data],
+                                   y=[row[y_column] for row in data]))
+            fig.update_layout(
+                title='Extracted Table Data',
+                xaxis_title=x_column,
+                yaxis_title=y_column
+            )
             return fig
         
         return None
@@ -450,18 +517,20 @@ def process_uploaded_image(image_path, output_dir="../data/extracted/"):
     
     if 'error' not in result:
         # Save extracted data
-        import os
         os.makedirs(output_dir, exist_ok=True)
         
+        # Include the image name so images processed in the same second
+        # (e.g. by process_batch) don't overwrite each other
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = f"{output_dir}extracted_data_{timestamp}.csv"
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        output_file = f"{output_dir}extracted_data_{timestamp}_{stem}.csv"
         
         processor.save_extracted_data(result, output_file)
         
         # Create visualization
         fig = processor.create_visualization_from_extracted_data(result)
         if fig:
-            viz_file = f"{output_dir}extracted_viz_{timestamp}.html"
+            viz_file = f"{output_dir}extracted_viz_{timestamp}_{stem}.html"
             fig.write_html(viz_file)
             result['visualization'] = viz_file
         
@@ -469,6 +538,18 @@ def process_uploaded_image(image_path, output_dir="../data/extracted/"):
     
     return result
 
+def process_batch(image_paths, output_dir="../data/extracted/", max_workers=None):
+    """
+    Process several uploaded images concurrently, one worker process per core
+    
+    Each image is independent and OCR runs in its own tesseract subprocess,
+    so the batch scales with the number of cores. Results are returned in
+    the same order as image_paths.
+    """
+    worker = functools.partial(process_uploaded_image, output_dir=output_dir)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(worker, image_paths))
+
 if __name__ == "__main__":
     # Test the processor
     print("Traffic Image Processor Ready!")
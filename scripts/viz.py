@@ -3,17 +3,64 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import numpy as np
 import os
 
-# Read Enhanced Data
-df_network = pd.read_csv("../data/traffic_network_data.csv")
-df_flow = pd.read_csv("../data/traffic_flow_timeseries.csv")
-df_routes = pd.read_csv("../data/route_performance.csv")
+try:
+    import pyarrow
+except ImportError:  # pyarrow is optional; pandas' C parser is used instead
+    pyarrow = None
 
-# Convert timestamp columns
-df_flow['Timestamp'] = pd.to_datetime(df_flow['Timestamp'])
+# Multithreaded Arrow CSV reader when available
+CSV_ENGINE = 'pyarrow' if pyarrow is not None else 'c'
+
+# Qualitative palette for per-city series, fetched from plotly once
+SET3 = np.array(px.colors.qualitative.Set3)
+
+# Static image export settings live on the shared kaleido scope, so every
+# write_image call reuses one renderer process (scope is None without kaleido)
+if pio.kaleido.scope is not None:
+    pio.kaleido.scope.default_format = "png"
+    pio.kaleido.scope.default_width = 1200
+    pio.kaleido.scope.default_height = 800
+    pio.kaleido.scope.default_scale = 2
+
+
+def _scatter(n):
+    """Pick the WebGL scatter trace for long series, SVG otherwise"""
+    return go.Scattergl if n > 1000 else go.Scatter
+
+# Read Enhanced Data (timestamps are parsed by the reader itself)
+df_network = pd.read_csv("../data/traffic_network_data.csv", engine=CSV_ENGINE,
+                         dtype={'City': 'category', 'Zone': 'category',
+                                'Traffic_Condition': 'category'})
+df_flow = pd.read_csv("../data/traffic_flow_timeseries.csv", engine=CSV_ENGINE,
+                      parse_dates=['Timestamp'])
+df_routes = pd.read_csv("../data/route_performance.csv", engine=CSV_ENGINE)
+
+
+# Coordinates stay float64 for sub-metre precision, as in data_gen.py
+COORD_COLUMNS = ('Latitude', 'Longitude')
+
+
+def _shrink(df):
+    """Downcast numeric columns and turn low-cardinality labels into categories"""
+    for col in df.select_dtypes('float64'):
+        if col not in COORD_COLUMNS:
+            df[col] = df[col].astype('float32')
+    for col in df.select_dtypes('int64'):
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in ('City', 'Zone', 'Traffic_Condition', 'Route_Type'):
+        if col in df:
+            df[col] = df[col].astype('category')
+    return df
+
+
+df_network = _shrink(df_network)
+df_flow = _shrink(df_flow)
+df_routes = _shrink(df_routes)
 
 # Color mapping for traffic conditions (matching reference image)
 color_map = {
@@ -29,24 +76,40 @@ color_map = {
 # 1. Main Traffic Network Map (inspired by reference multi-city view)
 fig_map = go.Figure()
 
+# Colors aligned with the Traffic_Condition category order, so a row's color
+# is a gather on its category code rather than a dict lookup
+condition_palette = np.array([color_map[c] for c in df_network['Traffic_Condition'].cat.categories])
+
+# All points go into one trace (one WebGL buffer and draw call) instead of
+# one trace per city
+speed_str = df_network['Current_Speed'].round(1).astype(str)
+hover_text = ("<b>" + df_network['City'].astype(str) + " - " + df_network['Zone'].astype(str) + "</b><br>" +
+              "Condition: " + df_network['Traffic_Condition'].astype(str) + "<br>" +
+              "Speed: " + speed_str + " km/h<br>" +
+              "Volume: " + df_network['Volume'].astype(str))
+
+fig_map.add_trace(go.Scattermapbox(
+    lat=df_network['Latitude'],
+    lon=df_network['Longitude'],
+    mode='markers',
+    marker=dict(
+        size=df_network['Volume']/50,  # Size based on traffic volume
+        color=condition_palette[df_network['Traffic_Condition'].cat.codes.to_numpy()],
+        sizemode='diameter'
+    ),
+    text=hover_text.tolist(),
+    hovertemplate='%{text}<extra></extra>',
+    showlegend=False
+))
+
+# Per-city legend entries: empty traces that draw no points
 for city in df_network['City'].unique():
-    city_data = df_network[df_network['City'] == city]
-    
     fig_map.add_trace(go.Scattermapbox(
-        lat=city_data['Latitude'],
-        lon=city_data['Longitude'],
+        lat=[None],
+        lon=[None],
         mode='markers',
-        marker=dict(
-            size=city_data['Volume']/50,  # Size based on traffic volume
-            color=[color_map[condition] for condition in city_data['Traffic_Condition']],
-            sizemode='diameter'
-        ),
-        text=[f"<b>{row['City']} - {row['Zone']}</b><br>" +
-              f"Condition: {row['Traffic_Condition']}<br>" +
-              f"Speed: {row['Current_Speed']:.1f} km/h<br>" +
-              f"Volume: {row['Volume']}" 
-              for _, row in city_data.iterrows()],
-        hovertemplate='%{text}<extra></extra>',
+        marker=dict(size=10, color='gray'),
+        hoverinfo='skip',
         name=city,
         showlegend=True
     ))
@@ -83,37 +146,51 @@ fig_timeseries = make_subplots(
            [{"secondary_y": False}, {"secondary_y": False}]]
 )
 
+# Long series add thousands of SVG nodes per trace without visible gain, so
+# resample each city into at most MAX_POINTS_PER_CITY time buckets
+MAX_POINTS_PER_CITY = 2000
+df_flow_plot = df_flow
+per_city = len(df_flow) // max(df_flow['City'].nunique(), 1)
+if per_city > MAX_POINTS_PER_CITY:
+    span = df_flow['Timestamp'].max() - df_flow['Timestamp'].min()
+    bucket = (span / MAX_POINTS_PER_CITY).ceil('min')
+    df_flow_plot = (df_flow.set_index('Timestamp')
+                    .groupby('City', sort=False, observed=True)
+                    .resample(bucket)
+                    .agg({'Traffic_Volume': 'mean', 'Average_Speed': 'mean',
+                          'Congestion_Level': 'mean', 'Incidents': 'sum'})
+                    .reset_index())
+
+# Group once and reuse the per-city frames in all four subplots
+flow_groups = list(df_flow_plot.groupby('City', sort=False, observed=True))
+
 # Traffic Volume
-for city in df_flow['City'].unique():
-    city_flow = df_flow[df_flow['City'] == city]
+for city, city_flow in flow_groups:
     fig_timeseries.add_trace(
-        go.Scatter(x=city_flow['Timestamp'], y=city_flow['Traffic_Volume'],
+        _scatter(len(city_flow))(x=city_flow['Timestamp'], y=city_flow['Traffic_Volume'],
                   mode='lines', name=f'{city} Volume', line=dict(width=3)),
         row=1, col=1
     )
 
 # Average Speed
-for city in df_flow['City'].unique():
-    city_flow = df_flow[df_flow['City'] == city]
+for city, city_flow in flow_groups:
     fig_timeseries.add_trace(
-        go.Scatter(x=city_flow['Timestamp'], y=city_flow['Average_Speed'],
+        _scatter(len(city_flow))(x=city_flow['Timestamp'], y=city_flow['Average_Speed'],
                   mode='lines', name=f'{city} Speed', line=dict(width=3)),
         row=1, col=2
     )
 
 # Congestion Levels (Area Chart)
-for city in df_flow['City'].unique():
-    city_flow = df_flow[df_flow['City'] == city]
+for i, (city, city_flow) in enumerate(flow_groups):
     fig_timeseries.add_trace(
-        go.Scatter(x=city_flow['Timestamp'], y=city_flow['Congestion_Level'],
-                  mode='lines', fill='tonexty' if city != df_flow['City'].unique()[0] else 'tozeroy',
+        _scatter(len(city_flow))(x=city_flow['Timestamp'], y=city_flow['Congestion_Level'],
+                  mode='lines', fill='tonexty' if i > 0 else 'tozeroy',
                   name=f'{city} Congestion', line=dict(width=2)),
         row=2, col=1
     )
 
 # Incidents
-for city in df_flow['City'].unique():
-    city_flow = df_flow[df_flow['City'] == city]
+for city, city_flow in flow_groups:
     fig_timeseries.add_trace(
         go.Bar(x=city_flow['Timestamp'], y=city_flow['Incidents'],
                name=f'{city} Incidents', opacity=0.7),
@@ -144,22 +221,22 @@ fig_performance = make_subplots(
 )
 
 # Route efficiency box plot
-for route_type in df_routes['Route_Type'].unique():
-    route_data = df_routes[df_routes['Route_Type'] == route_type]
+for route_type, route_data in df_routes.groupby('Route_Type', sort=False, observed=True):
     fig_performance.add_trace(
         go.Box(y=route_data['Efficiency_Score'], name=route_type,
                boxpoints='outliers', jitter=0.3, pointpos=-1.8),
         row=1, col=1
     )
 
-# Speed distribution histogram
-colors = px.colors.qualitative.Set3
-for i, city in enumerate(df_routes['City'].unique()):
-    city_routes = df_routes[df_routes['City'] == city]
+# Speed distribution histogram, pre-binned on shared edges so each city
+# ships 15 bar heights instead of every raw sample
+speed_edges = np.histogram_bin_edges(df_routes['Average_Speed'], bins=15)
+speed_centers = (speed_edges[:-1] + speed_edges[1:]) / 2
+for i, (city, city_routes) in enumerate(df_routes.groupby('City', sort=False, observed=True)):
+    counts, _ = np.histogram(city_routes['Average_Speed'], bins=speed_edges)
     fig_performance.add_trace(
-        go.Histogram(x=city_routes['Average_Speed'], name=city,
-                    opacity=0.7, nbinsx=15,
-                    marker_color=colors[i % len(colors)]),
+        go.Bar(x=speed_centers, y=counts, width=np.diff(speed_edges), name=city,
+               opacity=0.7, marker_color=SET3[i % len(SET3)]),
         row=1, col=2
     )
 
@@ -177,7 +254,21 @@ fig_performance.update_yaxes(title_text="Frequency", row=1, col=2)
 
 # --------------------------
 # 4. Traffic Condition Summary (Pie Charts)
-condition_summary = df_network['Traffic_Condition'].value_counts()
+# One groupby pass yields the per-city speed/volume and the per-condition
+# counts; the pie totals are the column sums of those counts
+conditions = df_network['Traffic_Condition'].cat.categories
+city_performance = pd.concat(
+    [df_network[['City', 'Current_Speed', 'Volume']],
+     pd.get_dummies(df_network['Traffic_Condition'], dtype='int32')],
+    axis=1
+).groupby('City', observed=True).agg({
+    'Current_Speed': 'mean',
+    'Volume': 'sum',
+    **dict.fromkeys(conditions, 'sum')
+}).reset_index()
+
+condition_summary = city_performance[conditions].sum()
+condition_summary = condition_summary[condition_summary > 0].sort_values(ascending=False)
 
 fig_summary = make_subplots(
     rows=1, cols=2,
@@ -188,17 +279,12 @@ fig_summary = make_subplots(
 # Pie chart for traffic conditions
 fig_summary.add_trace(
     go.Pie(labels=condition_summary.index, values=condition_summary.values,
-           marker_colors=[color_map[condition] for condition in condition_summary.index],
+           marker_colors=condition_palette[conditions.get_indexer(condition_summary.index)],
            name="Traffic Conditions"),
     row=1, col=1
 )
 
 # City performance bar chart
-city_performance = df_network.groupby('City').agg({
-    'Current_Speed': 'mean',
-    'Volume': 'sum'
-}).reset_index()
-
 fig_summary.add_trace(
     go.Bar(x=city_performance['City'], y=city_performance['Current_Speed'],
            name='Avg Speed', marker_color='lightblue', yaxis='y'),
@@ -242,11 +328,15 @@ master_dashboard = make_subplots(
 # Create outputs directory
 os.makedirs("../outputs", exist_ok=True)
 
+# Load plotly.js from the CDN instead of embedding the ~3 MB bundle in every
+# file, and skip the schema validation pass on export
+HTML_EXPORT = dict(include_plotlyjs='cdn', include_mathjax=False, validate=False)
+
 # Export individual charts and main dashboard
-fig_map.write_html("../outputs/traffic_map.html")
-fig_timeseries.write_html("../outputs/timeseries_analysis.html")
-fig_performance.write_html("../outputs/performance_analysis.html")
-fig_summary.write_html("../outputs/summary_dashboard.html")
+fig_map.write_html("../outputs/traffic_map.html", **HTML_EXPORT)
+fig_timeseries.write_html("../outputs/timeseries_analysis.html", **HTML_EXPORT)
+fig_performance.write_html("../outputs/performance_analysis.html", **HTML_EXPORT)
+fig_summary.write_html("../outputs/summary_dashboard.html", **HTML_EXPORT)
 
 # Create the main comprehensive dashboard
 main_dashboard = go.Figure()
@@ -276,10 +366,10 @@ main_dashboard.update_layout(
     plot_bgcolor='white'
 )
 
-main_dashboard.write_html("../outputs/dashboard.html")
+main_dashboard.write_html("../outputs/dashboard.html", **HTML_EXPORT)
 
 # Generate screenshot using the map (most representative)
-fig_map.write_image("../outputs/screenshot.png", width=1200, height=800, scale=2)
+pio.write_image(fig_map, "../outputs/screenshot.png", engine='kaleido')
 
 print("✅ Comprehensive Traffic Dashboard generated successfully!")
 print("   📊 Main dashboard: /outputs/dashboard.html")
@@ -1,31 +1,137 @@
 # scripts/web_app.py
 
-from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_file, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import orjson
 import os
+import re
 from werkzeug.utils import secure_filename
 import json
 from datetime import datetime
 import pandas as pd
 from image_processor import TrafficImageProcessor
+import multiprocessing
 import tempfile
+import threading
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Serialize responses with orjson, which handles numpy values and
+    datetimes natively. Naive datetimes are local time and stay unmarked
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__, static_folder='../interface', static_url_path='/static')
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all domains on all routes
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.config['UPLOAD_FOLDER'] = '../uploads'
 app.config['RESULTS_FOLDER'] = '../data/extracted'
 
 # Ensure directories exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['RESULTS_FOLDER'], exist_ok=True)
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff', 'pdf'}
 
+# Checks the extension without splitting or lowercasing the filename
+_ALLOWED_RE = re.compile(r'.*\.(?:%s)\Z' % '|'.join(sorted(ALLOWED_EXTENSIONS)),
+                         re.IGNORECASE | re.DOTALL)
+
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return _ALLOWED_RE.match(filename) is not None
+
+# The processor keeps no per-image state, so one instance per process
+# (including each pool worker) serves every upload
+_PROCESSOR = TrafficImageProcessor()
+
+# Image processing pool, created on first upload so each gunicorn worker
+# starts its own pool. The cores are shared between gunicorn workers
+# (WEB_CONCURRENCY, which gunicorn also reads as its worker count) unless
+# CITYPULSE_POOL_WORKERS sets the pool size directly
+POOL_WORKERS = int(os.environ.get(
+    'CITYPULSE_POOL_WORKERS',
+    max(1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', 1)))
+))
+
+# Pool processes are started from a clean server process rather than forked
+# from this multi-threaded one
+_POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+def _get_executor():
+    """Return the shared image processing pool, creating it if needed"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(max_workers=POOL_WORKERS,
+                                            mp_context=_POOL_CONTEXT)
+    return _EXECUTOR
+
+def _discard_executor(executor):
+    """Drop a pool whose worker died so the next upload starts a fresh one"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is executor:
+            _EXECUTOR = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def _submit_all(jobs):
+    """Submit upload jobs, replacing the pool once if it is already broken"""
+    executor = _get_executor()
+    try:
+        return executor, {executor.submit(_process_one, *job): i for i, job in enumerate(jobs)}
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        executor = _get_executor()
+        return executor, {executor.submit(_process_one, *job): i for i, job in enumerate(jobs)}
+
+def _process_one(image_bytes, original_name, timestamp, processed_at):
+    """Process one upload's bytes in a worker process and return its result"""
+    # Output files are named after the client's filename, so sanitize it
+    safe_name = secure_filename(original_name)
+    
+    try:
+        # Process the image straight from memory
+        result = _PROCESSOR.process_image(image_bytes)
+        result['filename'] = original_name
+        result['processed_at'] = processed_at
+        
+        # Save extracted data
+        if 'error' not in result:
+            save_path = os.path.join(app.config['RESULTS_FOLDER'], 
+                                   f"extracted_{timestamp}_{safe_name}.csv")
+            _PROCESSOR.save_extracted_data(result, save_path)
+            result['data_file'] = save_path
+            
+            # Create visualization
+            viz = _PROCESSOR.create_visualization_from_extracted_data(result)
+            if viz:
+                viz_path = os.path.join(app.config['RESULTS_FOLDER'], 
+                                      f"viz_{timestamp}_{safe_name}.html")
+                viz.write_html(viz_path)
+                result['visualization_file'] = viz_path
+        
+        return result
+        
+    except Exception as e:
+        return {
+            'filename': original_name,
+            'error': f'Processing failed: {str(e)}',
+            'processed_at': processed_at
+        }
 
 @app.route('/')
 def index():
@@ -36,26 +142,29 @@ def index():
     response.headers['Expires'] = '0'
     return response
 
+# The interface assets are cached by browsers for a year; index.html is never
+# cached and references them with a ?v= query, so bump that to ship changes
+STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+def _static_asset(filename):
+    response = app.send_static_file(filename)
+    response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+    return response
+
 @app.route('/styles.css')
 def serve_css():
     """Serve the CSS file"""
-    response = send_from_directory('../interface', 'styles.css')
-    response.headers['Content-Type'] = 'text/css'
-    return response
+    return _static_asset('styles.css')
 
 @app.route('/script.js')
 def serve_js():
     """Serve the JavaScript file"""
-    response = send_from_directory('../interface', 'script.js')
-    response.headers['Content-Type'] = 'application/javascript'
-    return response
+    return _static_asset('script.js')
 
 @app.route('/visualization.html')
 def serve_visualization():
     """Serve the visualization HTML file"""
-    response = send_from_directory('../interface', 'visualization.html')
-    response.headers['Content-Type'] = 'text/html'
-    return response
+    return _static_asset('visualization.html')
 
 @app.route('/upload', methods=['POST'])
 def upload_files():
@@ -69,55 +178,37 @@ def upload_files():
         if not files or all(file.filename == '' for file in files):
             return jsonify({'error': 'No files selected'}), 400
         
-        results = []
-        processor = TrafficImageProcessor()
+        # One clock read per request; the file index keeps output names
+        # unique when several uploads land in the same second
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        processed_at = now.isoformat()
         
-        for file in files:
+        # Read every upload first, then process them in parallel. The bytes
+        # go to the workers directly instead of a round trip through disk
+        jobs = []
+        for i, file in enumerate(files):
             if file and allowed_file(file.filename):
-                # Secure the filename
-                filename = secure_filename(file.filename)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{timestamp}_{filename}"
-                
-                # Save uploaded file
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(filepath)
-                
-                try:
-                    # Process the image
-                    result = processor.process_image(filepath)
-                    result['filename'] = file.filename
-                    result['processed_at'] = datetime.now().isoformat()
-                    
-                    # Save extracted data
-                    if 'error' not in result:
-                        save_path = os.path.join(app.config['RESULTS_FOLDER'], 
-                                               f"extracted_{timestamp}_{file.filename}.csv")
-                        processor.save_extracted_data(result, save_path)
-                        result['data_file'] = save_path
-                        
-                        # Create visualization
-                        viz = processor.create_visualization_from_extracted_data(result)
-                        if viz:
-                            viz_path = os.path.join(app.config['RESULTS_FOLDER'], 
-                                                  f"viz_{timestamp}_{file.filename}.html")
-                            viz.write_html(viz_path)
-                            result['visualization_file'] = viz_path
-                    
-                    results.append(result)
-                    
-                except Exception as e:
-                    results.append({
-                        'filename': file.filename,
-                        'error': f'Processing failed: {str(e)}',
-                        'processed_at': datetime.now().isoformat()
-                    })
-                
-                # Clean up uploaded file
-                try:
-                    os.remove(filepath)
-                except:
-                    pass
+                jobs.append((file.read(), file.filename, f"{timestamp}_{i}", processed_at))
+        
+        # Collect results as they finish, keeping them in upload order. A
+        # file whose worker crashed gets its own error entry like any other
+        # processing failure
+        executor, futures = _submit_all(jobs)
+        results = [None] * len(jobs)
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    _discard_executor(executor)
+                _, original_name, _, processed_at = jobs[i]
+                results[i] = {
+                    'filename': original_name,
+                    'error': f'Processing failed: {str(e)}',
+                    'processed_at': processed_at
+                }
         
         return jsonify({
             'success': True,
@@ -143,27 +234,32 @@ def download_file(result_type, filename):
             return jsonify({'error': 'Invalid result type'}), 400
         
         if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
+            # conditional/etag are Flask's defaults (>= 2.0), spelled out
+            # because downloads rely on them for 304 and Range responses
+            return send_file(file_path, as_attachment=True, conditional=True, etag=True)
         else:
             return jsonify({'error': 'File not found'}), 404
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Demo payload never changes, so it is serialized once at import time
+DEMO_DATA = {
+    'traffic_conditions': {
+        'Good': 40,
+        'Moderate': 35,
+        'Congested': 25
+    },
+    'cities': ['Amsterdam', 'New York', 'London', 'Kuala Lumpur'],
+    'sample_speeds': [45, 32, 28, 55, 38, 42, 29, 61, 35, 47],
+    'sample_volumes': [1200, 2800, 3400, 1800, 2200, 1900, 3100, 1600, 2400, 2000]
+}
+_DEMO_BYTES = orjson.dumps(DEMO_DATA)
+
 @app.route('/api/demo-data')
 def get_demo_data():
     """Get demo data for testing the interface"""
-    demo_data = {
-        'traffic_conditions': {
-            'Good': 40,
-            'Moderate': 35,
-            'Congested': 25
-        },
-        'cities': ['Amsterdam', 'New York', 'London', 'Kuala Lumpur'],
-        'sample_speeds': [45, 32, 28, 55, 38, 42, 29, 61, 35, 47],
-        'sample_volumes': [1200, 2800, 3400, 1800, 2200, 1900, 3100, 1600, 2400, 2000]
-    }
-    return jsonify(demo_data)
+    return Response(_DEMO_BYTES, mimetype='application/json')
 
 @app.route('/api/process-demo')
 def process_demo():
@@ -177,7 +273,7 @@ def process_demo():
             'speeds': [45, 32, 28, 55, 38],
             'conditions': ['Good', 'Moderate', 'Congested', 'Good', 'Moderate'],
             'volumes': [1200, 2800, 3400, 1800, 2200],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now()
         },
         'extracted_count': 5,
         'processing_time': '2.3 seconds'
@@ -189,19 +285,21 @@ def process_demo():
         'message': 'Demo processing complete!'
     })
 
+# Health responses only differ in the timestamp, so the rest is prebuilt
+_HEALTH_PREFIX = b'{"status":"healthy","timestamp":"'
+_HEALTH_SUFFIX = b'","version":"1.0.0"}'
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0'
-    })
+    body = _HEALTH_PREFIX + datetime.now().isoformat().encode() + _HEALTH_SUFFIX
+    return Response(body, mimetype='application/json')
 
 if __name__ == '__main__':
     print("🚀 Starting CityPulse Web Application...")
     print("📡 Interface will be available at: http://localhost:5000")
     print("📊 Upload interface ready for traffic image processing!")
     
-    # Run the Flask app
+    # Development server only; serve with gunicorn in production:
+    #   WEB_CONCURRENCY=4 gunicorn --threads 2 -b 0.0.0.0:5000 web_app:app
     app.run(debug=True, host='0.0.0.0', port=5000)